@@ -0,0 +1,111 @@
+import logging
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from .video_generator import generate_video
+
+logger = logging.getLogger(__name__)
+
+# Renders are CPU-bound and ffmpeg already spreads across cores, so a small
+# pool is enough; extra workers would just fight the encoder for cycles.
+_MAX_RENDER_WORKERS = 2
+
+_executor = ThreadPoolExecutor(
+    max_workers=_MAX_RENDER_WORKERS, thread_name_prefix="slideshow-render"
+)
+_jobs = {}
+_jobs_lock = threading.Lock()
+
+# Finished and failed jobs stay queryable this long, then get evicted the
+# next time the table is touched — without this the table grows for the
+# worker's whole lifetime.
+_JOB_TTL_SECONDS = 30 * 60
+
+
+def _prune_expired_locked(now):
+    """Drop expired terminal jobs; caller must hold _jobs_lock."""
+    expired = [job_id for job_id, job in _jobs.items()
+               if job["expires_at"] is not None and job["expires_at"] <= now]
+    for job_id in expired:
+        del _jobs[job_id]
+    if expired:
+        logger.debug("🧹 Pruned %s expired render jobs", len(expired))
+
+
+def submit_render(output_path, filename, render_kwargs, publish_path=None):
+    """Queue a render and return its job id immediately.
+
+    The HTTP worker is freed as soon as the uploads are on disk; clients
+    poll the status endpoint with the returned id and download the MP4
+    from there once the job reports done. When `publish_path` is set the
+    encode lands at `output_path` and is renamed into place only after it
+    succeeds, so a failed render never occupies the published path.
+    """
+    job_id = uuid.uuid4().hex
+    with _jobs_lock:
+        _prune_expired_locked(time.time())
+        _jobs[job_id] = {
+            "status": "pending",
+            "output_path": publish_path or output_path,
+            "filename": filename,
+            "error": None,
+            "expires_at": None,
+        }
+    _executor.submit(_run_render, job_id, render_kwargs, publish_path)
+    logger.debug("🧵 Render job %s queued", job_id)
+    return job_id
+
+
+def submit_completed(output_path, filename):
+    """Register an already-finished render and return its job id.
+
+    Lets an async request that hits the render cache keep the documented
+    202 + job_id contract: the job is born done and the status endpoint
+    serves the cached MP4 on the first poll.
+    """
+    job_id = uuid.uuid4().hex
+    now = time.time()
+    with _jobs_lock:
+        _prune_expired_locked(now)
+        _jobs[job_id] = {
+            "status": "done",
+            "output_path": output_path,
+            "filename": filename,
+            "error": None,
+            "expires_at": now + _JOB_TTL_SECONDS,
+        }
+    return job_id
+
+
+def get_job(job_id):
+    """Snapshot of a job's state, or None for an unknown or expired id."""
+    with _jobs_lock:
+        _prune_expired_locked(time.time())
+        job = _jobs.get(job_id)
+        return dict(job) if job else None
+
+
+def _update_job(job_id, **fields):
+    with _jobs_lock:
+        _jobs[job_id].update(fields)
+
+
+def _run_render(job_id, render_kwargs, publish_path=None):
+    _update_job(job_id, status="running")
+    try:
+        generate_video(**render_kwargs)
+        if publish_path:
+            os.replace(render_kwargs["output_path"], publish_path)
+        _update_job(job_id, status="done",
+                    expires_at=time.time() + _JOB_TTL_SECONDS)
+        logger.debug("🧵 Render job %s finished", job_id)
+    except Exception as e:
+        logger.exception("🔥 Render job %s failed", job_id)
+        partial = render_kwargs["output_path"]
+        if os.path.exists(partial):
+            os.unlink(partial)  # never leave a truncated encode behind
+        _update_job(job_id, status="failed", error=str(e),
+                    expires_at=time.time() + _JOB_TTL_SECONDS)
@@ -7,7 +7,7 @@ from .video_generator import generate_video
 
 
 class VideoGeneratorTests(TestCase):
-    @patch('moviepy.video.VideoClip.VideoClip.write_videofile')
+    @patch('api.video_generator._write_video_stream')
     def test_generate_video_with_image_effect(self, mock_write):
         image_path = os.path.join(settings.BASE_DIR, 'media', 'pic 10.webp')
         if not os.path.exists(image_path):
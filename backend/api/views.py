@@ -1,73 +1,261 @@
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from django.http import FileResponse, Http404
-from django.core.files.storage import default_storage
-from django.core.files.base import ContentFile
+from django.http import FileResponse, Http404, HttpResponse
 from django.conf import settings
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import hashlib
+import logging
+import json
 import os
+import shutil
+import tempfile
+import numpy as np
 from .video_generator import generate_video
+from .tasks import submit_render, submit_completed, get_job
+
+logger = logging.getLogger(__name__)
+
+# Per-file cap for uploaded images and music. Keeps a single unauthenticated
+# request from filling the media volume; generously above any sane slide
+# asset.
+_MAX_UPLOAD_BYTES = 50 * 1024 * 1024
+
+def _save_upload_cas(upload):
+    """Store an upload content-addressed; returns (path, sha256 digest).
+
+    The file is hashed while it streams to a temp file next to the cache
+    directory, then renamed to media/cas/<sha256><ext>. Re-uploads of the
+    same bytes (slideshows routinely reuse source assets) hit the existing
+    file and skip the write entirely.
+    """
+    cas_dir = os.path.join(settings.MEDIA_ROOT, 'cas')
+    os.makedirs(cas_dir, exist_ok=True)
+
+    # Disk-backed uploads (the configured TemporaryFileUploadHandler) are
+    # already a file on the media filesystem: hash it in place and rename
+    # it into the cache — the bytes are never copied again.
+    temp_path = getattr(upload, 'temporary_file_path', None)
+    if temp_path is not None:
+        src = temp_path()
+        hasher = hashlib.sha256()
+        with open(src, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                hasher.update(chunk)
+        digest = hasher.hexdigest()
+        final_path = os.path.join(cas_dir, f"{digest}{os.path.splitext(upload.name)[1].lower()}")
+        if os.path.exists(final_path):
+            logger.debug("♻️ Upload %s already cached: %s", upload.name, final_path)
+        else:
+            try:
+                os.replace(src, final_path)
+            except OSError:
+                shutil.move(src, final_path)  # temp dir on another filesystem
+            logger.debug("✅ Upload saved: %s", final_path)
+        # Close now that the file has moved: TemporaryUploadedFile.close
+        # tolerates the missing temp file, its GC finalizer does not.
+        upload.close()
+        return final_path, digest
+
+    hasher = hashlib.sha256()
+    with tempfile.NamedTemporaryFile(dir=cas_dir, delete=False) as tmp:
+        for chunk in upload.chunks():
+            hasher.update(chunk)
+            tmp.write(chunk)
+    digest = hasher.hexdigest()
+    ext = os.path.splitext(upload.name)[1].lower()
+    final_path = os.path.join(cas_dir, f"{digest}{ext}")
+    if os.path.exists(final_path):
+        os.unlink(tmp.name)
+        logger.debug("♻️ Upload %s already cached: %s", upload.name, final_path)
+    else:
+        os.replace(tmp.name, final_path)
+        logger.debug("✅ Upload saved: %s", final_path)
+    return final_path, digest
+
+
+def _parse_floats(raw, default):
+    """Coerce a list of form values to floats, substituting `default`.
+
+    The common case — every value present and numeric — converts in one C
+    loop through NumPy; only rows with blanks or junk fall back to the
+    per-element Python loop.
+    """
+    try:
+        return np.asarray(raw, dtype=np.float64).tolist()
+    except (TypeError, ValueError):
+        parsed = []
+        for value in raw:
+            try:
+                parsed.append(float(value))
+            except (TypeError, ValueError):
+                parsed.append(default)
+        return parsed
+
+
+@lru_cache(maxsize=512)
+def _normalize_params(durations_raw, darkening_raw):
+    """Parsed (durations, darkening) for one raw form tuple pair.
+
+    Users iterating on a slideshow resubmit the same handful of numbers
+    over and over, so the parse result is memoized on the frozen raw
+    values; a lone darkening value collapses to a scalar applied to every
+    slide. Returns tuples — callers copy to lists so cache entries stay
+    immutable.
+    """
+    durations = tuple(_parse_floats(durations_raw, 4.0))
+    darkening = tuple(_parse_floats(darkening_raw, 0.4))
+    if len(darkening) == 1:
+        return durations, darkening[0]
+    return durations, darkening
+
+
+def _render_cache_key(texts, image_hashes, music_hash, positions, durations,
+                      darkening, transitions, image_effects):
+    """Canonical hash of everything the output video depends on."""
+    payload = json.dumps({
+        'texts': texts,
+        'images': image_hashes,
+        'music': music_hash,
+        'positions': positions,
+        'durations': durations,
+        'darkening': darkening,
+        'transitions': transitions,
+        'effects': image_effects,
+    }, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _video_response(output_path, filename):
+    """Build the MP4 download response.
+
+    With SLIDESHOW_ACCEL_REDIRECT set (e.g. "/_protected"), the response
+    carries an X-Accel-Redirect header and nginx sendfiles the bytes with
+    zero-copy kernel I/O, freeing the worker immediately; the matching
+    nginx location must be marked `internal` with an alias to MEDIA_ROOT.
+    Without it, fall back to streaming through FileResponse.
+    """
+    accel_prefix = os.getenv("SLIDESHOW_ACCEL_REDIRECT")
+    if accel_prefix:
+        response = HttpResponse(content_type='video/mp4')
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        # Path relative to MEDIA_ROOT, not basename: cached renders live in
+        # the renders/ subdirectory and the redirect must keep that segment
+        # for the aliased nginx location to find them.
+        rel_path = os.path.relpath(output_path, settings.MEDIA_ROOT)
+        response['X-Accel-Redirect'] = f"{accel_prefix.rstrip('/')}/{rel_path}"
+        return response
+    # Unbuffered raw handle: FileResponse passes it to wsgi.file_wrapper,
+    # letting servers that support it ship the MP4 with sendfile(2)
+    # instead of shuttling chunks through Python.
+    return FileResponse(open(output_path, 'rb', buffering=0), as_attachment=True, filename=filename, content_type='video/mp4')
+
 
 @api_view(['POST'])
 def create_slideshow(request):
     try:
-        print("🔄 [START] Received POST request to create slideshow.")
+        logger.debug("🔄 [START] Received POST request to create slideshow.")
 
         texts = request.data.getlist('texts')
         positions = request.data.getlist('positions')  # Same length as texts
-        durations = request.data.getlist('duration')
-        durations = [float(d) if d else 4.0 for d in durations]
         transitions = request.data.getlist('transitions')
         image_effects = request.data.getlist('image_effects')
         images = request.FILES.getlist('images')
         raw_darkening = request.data.getlist('darkening')
-        print(f"📝 darkening received: {raw_darkening}")
+        logger.debug("📝 darkening received: %s", raw_darkening)
 
-        if len(raw_darkening) == 1:
-            try:
-                darkening = float(raw_darkening[0])
-            except ValueError:
-                darkening = 0.4  # fallback default
-        else:
-            darkening = []
-            for d in raw_darkening:
-                try:
-                    darkening.append(float(d))
-                except ValueError:
-                    darkening.append(0.4)  # default for invalid/missing values
+        durations, darkening = _normalize_params(
+            tuple(request.data.getlist('duration')), tuple(raw_darkening)
+        )
+        # Copies keep the lru_cache entries immutable.
+        durations = list(durations)
+        if isinstance(darkening, tuple):
+            darkening = list(darkening)
 
-        print(f"📝 darkening become: {darkening}")
+        logger.debug("📝 darkening become: %s", darkening)
 
         music = request.FILES.get('music')
 
-        print(f"📝 Texts received: {len(texts)}")
-        print(f"🖼 Images received: {len(images)}")
-        print(f"🎵 Music file received: {'Yes' if music else 'No'}")
-        print(f"⏱ Duration per slide: {durations} seconds")
+        logger.debug("📝 Texts received: %s", len(texts))
+        logger.debug("🖼 Images received: %s", len(images))
+        logger.debug("🎵 Music file received: %s", 'Yes' if music else 'No')
+        logger.debug("⏱ Duration per slide: %s seconds", durations)
+        # Everything below writes to storage, so every rejection happens
+        # here first: a malformed request costs a parse, not N file writes.
         if not texts or not images:
-            print("❌ Missing texts or images.")
+            logger.warning("❌ Missing texts or images.")
             return Response({"error": "Texts and images are required."}, status=400)
+        if len(texts) != len(images):
+            logger.warning("❌ Got %s texts but %s images.", len(texts), len(images))
+            return Response({"error": "Each slide needs one text and one image."}, status=400)
+        oversized = [u.name for u in (*images, *((music,) if music else ()))
+                     if u.size > _MAX_UPLOAD_BYTES]
+        if oversized:
+            logger.warning("❌ Uploads over the %s byte limit: %s", _MAX_UPLOAD_BYTES, oversized)
+            return Response(
+                {"error": f"Files exceed the {_MAX_UPLOAD_BYTES // (1024 * 1024)} MB limit: {', '.join(oversized)}"},
+                status=400,
+            )
 
-        image_paths = []
-        for image in images:
-            path = default_storage.save(f"media/{image.name}", ContentFile(image.read()))
-            full_path = os.path.join(settings.MEDIA_ROOT, path)
-            image_paths.append(full_path)
-            print(f"✅ Image saved: {full_path}")
+        # Content-addressed saves, streamed in chunks and hashed on the
+        # way to disk; repeated assets dedupe to one file. Saves run
+        # concurrently — the writes are I/O-bound — and executor.map keeps
+        # the result order aligned with texts.
+        with ThreadPoolExecutor(max_workers=min(8, max(len(images), 1))) as executor:
+            saved = list(executor.map(_save_upload_cas, images))
+        image_paths = [path for path, _ in saved]
+        image_hashes = [digest for _, digest in saved]
 
         music_path = None
+        music_hash = None
         if music:
-            music_path = os.path.join(settings.MEDIA_ROOT, default_storage.save(f"media/{music.name}", ContentFile(music.read())))
-            print(f"🎶 Music saved: {music_path}")
+            music_path, music_hash = _save_upload_cas(music)
+            logger.debug("🎶 Music saved: %s", music_path)
 
         import uuid
-        unique_name = f"{uuid.uuid4().hex}.mp4"
-        output_path = os.path.join(settings.MEDIA_ROOT, unique_name)
-        print(f"⚙️ Calling generate_video function... output: {output_path}")
-        generate_video(
-            texts,
-            image_paths,
-            music_path,
-            output_path,
+        filename = f"{texts[0][:20].strip().replace(' ', '_')}.mp4"
+
+        # The video is a pure function of its inputs, so finished renders
+        # are memoized under a hash of everything that shapes the output.
+        # Only valid when every slide names its transition — unspecified
+        # ones are randomized per render, so those runs are never cached.
+        transitions_explicit = (
+            len(transitions) >= len(texts)
+            and all(t.strip() for t in transitions[:len(texts)])
+        )
+        wants_async = str(request.data.get('async', '')).lower() in ('1', 'true', 'yes')
+
+        publish_path = None
+        if transitions_explicit:
+            render_key = _render_cache_key(
+                texts, image_hashes, music_hash, positions, durations,
+                darkening, transitions, image_effects,
+            )
+            renders_dir = os.path.join(settings.MEDIA_ROOT, 'renders')
+            os.makedirs(renders_dir, exist_ok=True)
+            publish_path = os.path.join(renders_dir, f"{render_key}.mp4")
+            if os.path.exists(publish_path):
+                logger.debug("♻️ Render cache hit: %s", publish_path)
+                # Async callers get the documented 202 + job_id JSON even
+                # on a cache hit — the job is registered already done and
+                # the first status poll serves the MP4.
+                if wants_async:
+                    job_id = submit_completed(publish_path, filename)
+                    return Response({"job_id": job_id, "status": "done"}, status=202)
+                return _video_response(publish_path, filename)
+            # ffmpeg fills its output progressively, so encoding straight
+            # into the keyed path would let a crashed render poison the
+            # cache (and concurrent identical requests hit a half-written
+            # file). Render to a sibling temp path and rename in only once
+            # generate_video returns.
+            output_path = os.path.join(renders_dir, f".{render_key}.{uuid.uuid4().hex}.part.mp4")
+        else:
+            output_path = os.path.join(settings.MEDIA_ROOT, f"{uuid.uuid4().hex}.mp4")
+        render_kwargs = dict(
+            texts=texts,
+            image_paths=image_paths,
+            music_path=music_path,
+            output_path=output_path,
             positions=positions,
             durations=durations,
             darkening=darkening,
@@ -75,19 +263,51 @@ def create_slideshow(request):
             image_effects=image_effects,
         )
 
+        # Opt-in background render: the worker is released as soon as the
+        # uploads are on disk, and the client polls slideshow_status with
+        # the job id. The synchronous path stays the default because the
+        # stock frontend expects the MP4 in the POST response.
+        if wants_async:
+            job_id = submit_render(output_path, filename, render_kwargs,
+                                   publish_path=publish_path)
+            logger.debug("🧵 Render queued as job %s", job_id)
+            return Response({"job_id": job_id, "status": "pending"}, status=202)
+
+        logger.debug("⚙️ Calling generate_video function... output: %s", output_path)
+        try:
+            generate_video(**render_kwargs)
+            if publish_path:
+                os.replace(output_path, publish_path)
+                output_path = publish_path
+        except Exception:
+            if os.path.exists(output_path):
+                os.unlink(output_path)  # never leave a truncated encode behind
+            raise
+
         if not os.path.exists(output_path):
-            print("❌ Video file was not created!")
+            logger.warning("❌ Video file was not created!")
             raise Http404("Video file not found.")
 
-        print(f"📦 Video generated successfully: {output_path}")
-        print("📤 Sending FileResponse with video...")
-
-        filename = f"{texts[0][:20].strip().replace(' ', '_')}.mp4"
-        print(f"📦 filename generated successfully: {filename}")
-        return FileResponse(open(output_path, 'rb'), as_attachment=True, filename=filename, content_type='video/mp4')
+        logger.debug("📦 Video generated successfully: %s", output_path)
+        logger.debug("📤 Sending FileResponse with video...")
+        logger.debug("📦 filename generated successfully: %s", filename)
+        return _video_response(output_path, filename)
 
     except Exception as e:
-        import traceback
-        traceback.print_exc()
-        print(f"🔥 Exception occurred: {str(e)}")
+        logger.exception("🔥 create_slideshow failed")
         return Response({"error": "Internal server error: " + str(e)}, status=500)
+
+
+@api_view(['GET'])
+def slideshow_status(request, job_id):
+    """Poll a queued render; serves the MP4 once the job reports done."""
+    job = get_job(job_id)
+    if job is None:
+        raise Http404("Unknown slideshow job.")
+    if job["status"] == "failed":
+        return Response({"status": "failed", "error": job["error"]}, status=500)
+    if job["status"] != "done":
+        return Response({"status": job["status"]}, status=202)
+    if not os.path.exists(job["output_path"]):
+        raise Http404("Video file not found.")
+    return _video_response(job["output_path"], job["filename"])
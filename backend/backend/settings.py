@@ -77,6 +77,15 @@ TEMPLATES = [
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Always parse uploads to disk-backed temp files (no in-memory tier): the
+# slideshow view renames the parsed file straight into the content cache,
+# and temping inside MEDIA_ROOT keeps that rename on one filesystem.
+FILE_UPLOAD_HANDLERS = [
+    'django.core.files.uploadhandler.TemporaryFileUploadHandler',
+]
+FILE_UPLOAD_TEMP_DIR = os.path.join(MEDIA_ROOT, 'tmp')
+os.makedirs(FILE_UPLOAD_TEMP_DIR, exist_ok=True)
+
 
 WSGI_APPLICATION = 'backend.wsgi.application'
 
@@ -16,11 +16,12 @@ Including another URLconf
 """
 from django.contrib import admin
 from django.urls import path
-from api.views import create_slideshow
+from api.views import create_slideshow, slideshow_status
 from django.conf import settings
 from django.conf.urls.static import static
 
 urlpatterns = [
     path('admin/', admin.site.urls),
     path('api/create-slideshow/', create_slideshow),
+    path('api/slideshow/<str:job_id>/', slideshow_status),
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)